@@ -1,8 +1,25 @@
 from django.contrib import admin
-from .models import Essay
+from .models import Assignment, Essay, ShadowModel, ShadowPrediction
+
+@admin.register(Assignment)
+class AssignmentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'target_words', 'created_at')
+    search_fields = ('title', 'prompt', 'keywords')
 
 @admin.register(Essay)
 class EssayAdmin(admin.ModelAdmin):
-    list_display = ('title', 'student_name', 'score_overall', 'created_at')
+    list_display = ('title', 'student_name', 'assignment', 'score_overall', 'created_at')
     search_fields = ('title', 'student_name', 'content')
     readonly_fields = ('score_overall','score_length','score_clarity','score_vocabulary','score_readability','feedback','created_at')
+
+
+@admin.register(ShadowModel)
+class ShadowModelAdmin(admin.ModelAdmin):
+    list_display = ('name', 'path', 'sample_rate', 'active', 'created_at')
+    list_editable = ('sample_rate', 'active')
+
+
+@admin.register(ShadowPrediction)
+class ShadowPredictionAdmin(admin.ModelAdmin):
+    list_display = ('shadow_model', 'essay', 'production_score', 'candidate_score', 'production_ms', 'candidate_ms', 'created_at')
+    list_filter = ('shadow_model',)
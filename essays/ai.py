@@ -3,15 +3,32 @@ import math
 from typing import Dict, List, Optional, Tuple
 import textstat
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import os
 try:
     import language_tool_python
-    _LT = language_tool_python.LanguageToolPublicAPI('en-US')
 except Exception:
-    _LT = None
+    language_tool_python = None
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import joblib
-import os
+from .rubrics import DEFAULT_ML_WEIGHTS
+
+
+def configure_language_tool(url: Optional[str] = None):
+    """Point grammar checks at a LanguageTool server (public API when ``url`` is empty)."""
+    global _LT
+    try:
+        if url:
+            _LT = language_tool_python.LanguageTool('en-US', remote_server=url)
+        else:
+            _LT = language_tool_python.LanguageToolPublicAPI('en-US')
+    except Exception:
+        _LT = None
+    return _LT
+
+
+_LT = None
+configure_language_tool(os.environ.get("LANGUAGETOOL_URL"))
 
 _ANALYZER = SentimentIntensityAnalyzer()
 
@@ -95,16 +112,17 @@ def topic_relevance(text: str, topic: Optional[str] = None, keywords: Optional[L
     sim = cosine_similarity(X[0], X[1])[0][0] 
     return round(sim * 100, 2)
 
-def _extract_features(text: str) -> Dict[str, float]:
+def _extract_features(text: str, grammar: Optional[Dict[str, object]] = None) -> Dict[str, float]:
+    """Model features for ``text``; pass ``grammar`` to reuse an existing grammar_suggestions() result."""
     words = text.split()
     sentences = [s for s in text.replace("?", ".").replace("!", ".").split(".") if s.strip()]
-    uniq = len(set(w.lower().strip(".,;:!?\"'()[]{}")) for w in words) if words else 0
+    uniq = len(set(w.lower().strip(".,;:!?\"'()[]{}") for w in words)) if words else 0
     avg_sent_len = (len(words) / len(sentences)) if sentences else 0
     type_token_ratio = (uniq / len(words) * 100) if words else 0
 
     read = readability_metrics(text)
     sent = sentiment_score(text)
-    gram = grammar_suggestions(text)
+    gram = grammar if grammar is not None else grammar_suggestions(text)
 
     return {
         "word_count": len(words),
@@ -129,26 +147,48 @@ def _features_to_vector(feat: Dict[str, float]) -> list[float]:
     ]
 
 
-def ml_score(text: str) -> Tuple[float, Dict[str, float]]:
-    feat = _extract_features(text)
-    if os.path.exists(ML_MODEL_PATH):
-        try:
-            model = joblib.load(ML_MODEL_PATH)
-            x = [_features_to_vector(feat)]
-            y = float(model.predict(x)[0])
-            return max(0.0, min(100.0, y)), feat
-        except Exception:
-            pass
+_MODEL_CACHE: Dict[str, Tuple[float, object]] = {}
+
+
+def load_scorer(path: str = ML_MODEL_PATH):
+    """Load a pickled scorer, reusing the cached copy until the file changes on disk."""
+    mtime = os.path.getmtime(path)
+    cached = _MODEL_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    model = joblib.load(path)
+    _MODEL_CACHE[path] = (mtime, model)
+    return model
+
+
+def predict_score(model, feat: Dict[str, float]) -> float:
+    y = float(model.predict([_features_to_vector(feat)])[0])
+    return max(0.0, min(100.0, y))
+
+
+def heuristic_score(feat: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> float:
     richness = min(100.0, feat["type_token_ratio"])
     length_score = min(100.0, feat["word_count"] / 400.0 * 100.0)
     structure = min(100.0, feat["avg_sentence_len"] / 25.0 * 100.0) if feat["avg_sentence_len"] else 60.0
 
+    w = weights or DEFAULT_ML_WEIGHTS
     score = (
-        0.30 * feat["readability"] +
-        0.30 * feat["grammar"] +
-        0.10 * feat["sentiment"] +
-        0.15 * richness +
-        0.10 * length_score +
-        0.05 * structure
+        w["readability"] * feat["readability"] +
+        w["grammar"] * feat["grammar"] +
+        w["sentiment"] * feat["sentiment"] +
+        w["richness"] * richness +
+        w["length"] * length_score +
+        w["structure"] * structure
     )
-    return round(score, 2), feat
+    return round(score, 2)
+
+
+def ml_score(text: str, weights: Optional[Dict[str, float]] = None,
+             grammar: Optional[Dict[str, object]] = None) -> Tuple[float, Dict[str, float]]:
+    feat = _extract_features(text, grammar)
+    if os.path.exists(ML_MODEL_PATH):
+        try:
+            return predict_score(load_scorer(ML_MODEL_PATH), feat), feat
+        except Exception:
+            pass
+    return heuristic_score(feat, weights), feat
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 class EssaysConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'essays'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .sqlite import apply_pragmas
+        connection_created.connect(apply_pragmas, dispatch_uid='essays.sqlite.apply_pragmas')
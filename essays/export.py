@@ -0,0 +1,132 @@
+import csv
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Essay
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_CHUNK_SIZE = 2000
+
+SCORE_COLUMNS = [
+    'score_overall',
+    'score_length',
+    'score_clarity',
+    'score_vocabulary',
+    'score_readability',
+]
+
+ANALYSIS_COLUMNS = [
+    'readability',
+    'sentiment',
+    'grammar_score',
+    'grammar_issues',
+    'topic_relevance',
+    'ml_overall',
+]
+
+EXPORT_COLUMNS = ['id', 'created_at', 'assignment_id', 'title', 'student_name'] + SCORE_COLUMNS + ['feedback'] + ANALYSIS_COLUMNS
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula.
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+_QUERY_FIELDS = ['id', 'created_at', 'assignment_id', 'title', 'student_name'] + SCORE_COLUMNS + ['feedback', 'analysis']
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _parse_bound(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    if not value:
+        return None
+    dt = parse_datetime(value)
+    if dt is None:
+        d = parse_date(value)
+        if d is None:
+            raise ValueError(f"Invalid date: {value!r}")
+        dt = datetime.combine(d, time.max if end_of_day else time.min)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def filter_essays(start: Optional[str] = None, end: Optional[str] = None,
+                  student: Optional[str] = None, title: Optional[str] = None):
+    """Build the export queryset. Dates accept YYYY-MM-DD or ISO datetimes; ``end`` is inclusive."""
+    qs = Essay.objects.all()
+    start_dt = _parse_bound(start)
+    end_dt = _parse_bound(end, end_of_day=True)
+    if start_dt:
+        qs = qs.filter(created_at__gte=start_dt)
+    if end_dt:
+        qs = qs.filter(created_at__lte=end_dt)
+    if student:
+        qs = qs.filter(student_name__icontains=student)
+    if title:
+        qs = qs.filter(title__icontains=title)
+    return qs.order_by('pk').values(*_QUERY_FIELDS)
+
+
+def _analysis_metrics(analysis: Any) -> Dict[str, Any]:
+    analysis = analysis if isinstance(analysis, dict) else {}
+    grammar = analysis.get('grammar', {})
+    if not isinstance(grammar, dict):
+        grammar = {}
+    issues = grammar.get('issues', [])
+    topic_rel = analysis.get('topic_relevance', '')
+    if isinstance(topic_rel, dict):
+        topic_rel = topic_rel.get('score', '')
+    return {
+        'readability': analysis.get('readability', ''),
+        'sentiment': analysis.get('sentiment', ''),
+        'grammar_score': grammar.get('grammar_score', grammar.get('score', '')),
+        'grammar_issues': len(issues) if isinstance(issues, list) else '',
+        'topic_relevance': topic_rel,
+        'ml_overall': analysis.get('ml_overall', ''),
+    }
+
+
+def export_row(values: Dict[str, Any]) -> Dict[str, Any]:
+    row = {col: values.get(col) for col in EXPORT_COLUMNS if col in values}
+    created = row.get('created_at')
+    if isinstance(created, (datetime, date)):
+        row['created_at'] = created.isoformat()
+    row.update(_analysis_metrics(values.get('analysis')))
+    return row
+
+
+def iter_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    for values in queryset.iterator(chunk_size=chunk_size):
+        yield export_row(values)
+
+
+def _csv_safe(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({k: _csv_safe(v) for k, v in row.items()})
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def stream_export(queryset, fmt: str = 'csv', chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+    rows = iter_rows(queryset, chunk_size=chunk_size)
+    return iter_csv(rows) if fmt == 'csv' else iter_ndjson(rows)
@@ -0,0 +1,299 @@
+import csv
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Essay
+
+DEFAULT_MIX = {'submit': 5, 'detail': 3, 'dashboard': 1}
+
+_WORDS = (
+    "education technology students learning climate energy policy history society culture "
+    "research evidence argument analysis community government economy health science future "
+    "important significant however therefore because although clearly often many people world"
+).split()
+
+
+class LanguageToolStub:
+    """Local stand-in for a LanguageTool server that answers /v2/languages and /v2/check
+    after a simulated latency, so grading can be load-tested offline."""
+
+    def __init__(self, latency_ms: float = 150.0, jitter_ms: float = 50.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlparse(self.path).path.rstrip('/')
+                if path.endswith('/languages'):
+                    body = [{"name": "English (US)", "code": "en", "longCode": "en-US"}]
+                elif path.endswith('/check'):
+                    stub._sleep()
+                    body = {"matches": []}
+                else:
+                    self.send_error(404)
+                    return
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _sleep(self):
+        with self._lock:
+            self.requests += 1
+        delay = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+        time.sleep(delay)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "LanguageToolStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def use_scratch_database(path: str) -> None:
+    """Repoint the default SQLite alias at ``path`` and migrate it."""
+    conn = connections['default']
+    if conn.vendor != 'sqlite':
+        raise ValueError("Scratch databases are only supported for SQLite")
+    conn.close()
+    # Thread-local connections are built from this same dict, so workers pick up the new file.
+    conn.settings_dict['NAME'] = path
+    call_command('migrate', verbosity=0, interactive=False)
+    conn.close()
+
+
+def load_corpus(path: str) -> List[Dict[str, str]]:
+    """Read essays from CSV (``essay``/``content`` and optional ``title`` columns) or NDJSON."""
+    essays = []
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for i, row in enumerate(rows):
+            content = row.get("content") or row.get("essay") or ""
+            if content.strip():
+                essays.append({"title": row.get("title") or f"Essay {i + 1}", "content": content})
+    return essays
+
+
+def synthetic_corpus(n: int = 200, seed: int = 0, min_words: int = 80, max_words: int = 400) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    essays = []
+    for i in range(n):
+        target = rng.randint(min_words, max_words)
+        sentences, count = [], 0
+        while count < target:
+            length = rng.randint(6, 24)
+            sentences.append(" ".join(rng.choice(_WORDS) for _ in range(length)).capitalize() + ".")
+            count += length
+        essays.append({"title": f"Synthetic essay {i + 1}", "content": " ".join(sentences)})
+    return essays
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown view in mix: {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def _is_lock_error(exc: BaseException) -> bool:
+    return isinstance(exc, OperationalError) and "locked" in str(exc).lower()
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+class _WriteTimer:
+    """execute_wrapper that sums time spent in INSERT/UPDATE/DELETE statements.
+
+    Under autocommit each write also acquires SQLite's write lock and commits, so with
+    a busy timeout this is where lock contention shows up as waiting instead of errors.
+    """
+
+    def __init__(self):
+        self.ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() not in ('INSERT', 'UPDATE', 'DELETE'):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.ms += (time.perf_counter() - start) * 1000.0
+
+
+class _Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock_errors = defaultdict(int)
+
+    def add(self, view: str, ms: float, queries: int, write_ms: float = 0.0,
+            error: Optional[BaseException] = None):
+        with self._lock:
+            self.samples[view].append((ms, queries, write_ms))
+            if error is not None:
+                self.errors[view] += 1
+                if _is_lock_error(error):
+                    self.lock_errors[view] += 1
+
+
+def summarize(recorder: _Recorder, wall_seconds: float) -> Dict[str, object]:
+    views = {}
+    total = 0
+    for view, samples in sorted(recorder.samples.items()):
+        latencies = [ms for ms, _, _ in samples]
+        queries = [q for _, q, _ in samples]
+        write_ms = [w for _, _, w in samples]
+        n = len(samples)
+        total += n
+        views[view] = {
+            'requests': n,
+            'errors': recorder.errors[view],
+            'lock_errors': recorder.lock_errors[view],
+            'throughput_rps': round(n / wall_seconds, 2) if wall_seconds else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p90_ms': round(percentile(latencies, 90), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'max_ms': round(max(latencies), 1) if latencies else 0.0,
+            'queries_mean': round(sum(queries) / n, 1) if n else 0.0,
+            'queries_max': max(queries) if queries else 0,
+            'write_ms_total': round(sum(write_ms), 1),
+            'write_ms_p50': round(percentile(write_ms, 50), 1),
+            'write_ms_p95': round(percentile(write_ms, 95), 1),
+            'write_ms_max': round(max(write_ms), 1) if write_ms else 0.0,
+        }
+    return {
+        'requests': total,
+        'wall_seconds': round(wall_seconds, 2),
+        'throughput_rps': round(total / wall_seconds, 2) if wall_seconds else 0.0,
+        'errors': sum(recorder.errors.values()),
+        'lock_errors': sum(recorder.lock_errors.values()),
+        'write_ms_total': round(sum(v['write_ms_total'] for v in views.values()), 1),
+        'views': views,
+    }
+
+
+def run_load(corpus: List[Dict[str, str]], requests: int = 200, concurrency: int = 4,
+             mix: Optional[Dict[str, int]] = None, seed: int = 0) -> Dict[str, object]:
+    """Replay ``corpus`` against the submit/detail/dashboard views from ``concurrency`` threads."""
+    if not corpus:
+        raise ValueError("Corpus is empty")
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = [name for name, weight in mix.items() for _ in range(weight)]
+    plan = [rng.choice(names) for _ in range(requests)]
+    plan_lock = threading.Lock()
+    pks = list(Essay.objects.values_list('pk', flat=True)[:1000])
+    pk_lock = threading.Lock()
+    recorder = _Recorder()
+
+    def next_task():
+        with plan_lock:
+            return plan.pop() if plan else None
+
+    def worker(worker_id: int):
+        client = Client(raise_request_exception=True)
+        local_rng = random.Random(seed + worker_id + 1)
+        try:
+            while True:
+                view = next_task()
+                if view is None:
+                    return
+                if view == 'detail':
+                    with pk_lock:
+                        pk = local_rng.choice(pks) if pks else None
+                    if pk is None:
+                        view = 'submit'
+                error = None
+                writes = _WriteTimer()
+                with CaptureQueriesContext(connection) as ctx, connection.execute_wrapper(writes):
+                    start = time.perf_counter()
+                    try:
+                        if view == 'submit':
+                            essay = local_rng.choice(corpus)
+                            response = client.post(reverse('essays:submit'), {
+                                'title': essay['title'][:200],
+                                'student_name': f"loadtest-{worker_id}",
+                                'content': essay['content'],
+                            })
+                            match = re.search(r'/essay/(\d+)/', response.get('Location', ''))
+                            if match:
+                                with pk_lock:
+                                    pks.append(int(match.group(1)))
+                            else:
+                                error = RuntimeError(f"submit returned {response.status_code} without redirect")
+                        elif view == 'detail':
+                            response = client.get(reverse('essays:detail', args=[pk]))
+                        else:
+                            response = client.get(reverse('essays:dashboard'))
+                        if error is None and response.status_code >= 400:
+                            error = RuntimeError(f"status {response.status_code}")
+                    except Exception as e:
+                        error = e
+                    elapsed = (time.perf_counter() - start) * 1000.0
+                recorder.add(view, elapsed, len(ctx.captured_queries), writes.ms, error)
+        finally:
+            close_old_connections()
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"loadtest-{i}") for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(recorder, time.perf_counter() - start)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from essays.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, filter_essays, stream_export
+
+
+class Command(BaseCommand):
+    help = "Stream graded essays (scores, feedback, analysis metrics) as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--start', help="Only essays created on/after this date (YYYY-MM-DD or ISO datetime).")
+        parser.add_argument('--end', help="Only essays created on/before this date (inclusive).")
+        parser.add_argument('--student', help="Case-insensitive match on student name.")
+        parser.add_argument('--title', help="Case-insensitive match on essay title.")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+        parser.add_argument('-o', '--output', help="Write to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            qs = filter_essays(options['start'], options['end'], options['student'], options['title'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = stream_export(qs, options['format'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,92 @@
+import contextlib
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from essays import ai
+from essays.sqlite import coalescer_stats, reset_coalescer
+from essays.loadtest import (
+    LanguageToolStub, load_corpus, parse_mix, run_load, synthetic_corpus, use_scratch_database,
+)
+
+
+class Command(BaseCommand):
+    help = ("Replay an essay corpus against the submit, detail and dashboard views with N concurrent "
+            "clients and report throughput, latency percentiles, SQLite lock errors, time spent in "
+            "writes and query counts.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', help="CSV (essay/content, title) or NDJSON file; synthetic essays if omitted.")
+        parser.add_argument('--synthetic', type=int, default=200, help="Number of synthetic essays to generate.")
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--mix', default='submit=5,detail=3,dashboard=1')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--lt-latency', type=float, default=150.0, help="Mean stub LanguageTool latency (ms).")
+        parser.add_argument('--lt-jitter', type=float, default=50.0)
+        parser.add_argument('--database', help="SQLite file to run against (default: a fresh temporary database).")
+        parser.add_argument('--in-place', action='store_true', help="Run against the configured database. Writes load-test essays into it.")
+        parser.add_argument('--json', action='store_true')
+        parser.add_argument('--show-view-output', action='store_true', help="Don't silence print() output from the views.")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        corpus = load_corpus(options['corpus']) if options['corpus'] else synthetic_corpus(options['synthetic'], options['seed'])
+
+        with contextlib.ExitStack() as stack:
+            if not options['in_place']:
+                path = options['database']
+                if not path:
+                    path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), 'loadtest.sqlite3')
+                try:
+                    use_scratch_database(path)
+                except ValueError as e:
+                    raise CommandError(f"{e}; use --in-place.")
+
+            stub = stack.enter_context(LanguageToolStub(options['lt_latency'], options['lt_jitter']))
+            previous_lt = ai._LT
+            if ai.configure_language_tool(stub.url) is None:
+                raise CommandError("Could not connect grammar checks to the LanguageTool stub.")
+            stack.callback(setattr, ai, '_LT', previous_lt)
+
+            if not options['show_view_output']:
+                devnull = stack.enter_context(open(os.devnull, 'w'))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            report = run_load(corpus, options['requests'], options['concurrency'], mix, options['seed'])
+            report['languagetool_calls'] = stub.requests
+            # With SQLITE_TUNING batching, essay INSERTs run on the writer thread's connection,
+            # so they are missing from the per-view query counts and write times above.
+            report['batched_writes'] = coalescer_stats()
+            reset_coalescer()
+
+        report['concurrency'] = options['concurrency']
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print(report)
+
+    def _print(self, r):
+        self.stdout.write(
+            f"{r['requests']} requests, concurrency {r['concurrency']}, {r['wall_seconds']}s, "
+            f"{r['throughput_rps']} req/s, {r['errors']} errors ({r['lock_errors']} 'database is locked'), "
+            f"{r['languagetool_calls']} LanguageTool calls, {r['write_ms_total']:.0f}ms in writes"
+        )
+        self.stdout.write(f"{'view':<11}{'n':>6}{'err':>5}{'lock':>5}{'rps':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'q/req':>7}{'q max':>7}{'wr p50':>8}{'wr p95':>8}{'wr max':>8}")
+        for name, v in r['views'].items():
+            self.stdout.write(
+                f"{name:<11}{v['requests']:>6}{v['errors']:>5}{v['lock_errors']:>5}{v['throughput_rps']:>8.2f}"
+                f"{v['p50_ms']:>9.1f}{v['p90_ms']:>9.1f}{v['p99_ms']:>9.1f}{v['max_ms']:>9.1f}"
+                f"{v['queries_mean']:>7.1f}{v['queries_max']:>7}"
+                f"{v['write_ms_p50']:>8.1f}{v['write_ms_p95']:>8.1f}{v['write_ms_max']:>8.1f}"
+            )
+        batched = r['batched_writes']
+        if batched:
+            self.stdout.write(
+                f"Batched writes (not in the per-view columns): {batched['saved']} rows in "
+                f"{batched['batches']} transactions, {batched['flush_ms']:.0f}ms on the writer thread"
+            )
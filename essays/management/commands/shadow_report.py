@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from essays.shadow import shadow_report
+
+
+class Command(BaseCommand):
+    help = "Compare shadow candidate scorers against the production model (drift, agreement, latency)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tolerance', type=float, help="Max |candidate - production| counted as agreement.")
+        parser.add_argument('--json', action='store_true', help="Emit the report as JSON.")
+
+    def handle(self, *args, **options):
+        report = shadow_report(options['tolerance'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if not report:
+            self.stdout.write("No shadow models registered.")
+            return
+        header = f"{'model':<24}{'n':>7}{'err':>5}{'drift':>8}{'|diff|':>8}{'agree%':>8}{'prod ms':>10}{'cand ms':>10}{'cand p95':>10}"
+        self.stdout.write(header)
+        for r in report:
+            self.stdout.write(
+                f"{r['name'][:23]:<24}{r['samples']:>7}{r['errors']:>5}{r['mean_drift']:>8.2f}{r['mean_abs_diff']:>8.2f}"
+                f"{r['agreement']:>8.1f}{r['production_ms_mean']:>10.3f}{r['candidate_ms_mean']:>10.3f}{r['candidate_ms_p95']:>10.3f}"
+            )
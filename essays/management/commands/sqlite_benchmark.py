@@ -0,0 +1,131 @@
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from essays import ai
+from essays.loadtest import LanguageToolStub, _is_lock_error, percentile, synthetic_corpus, use_scratch_database
+from essays.models import Essay
+from essays.sqlite import reset_coalescer, save_result, sqlite_tuning
+from essays.utils import grade_text
+
+PROFILES = ('default', 'tuned')
+
+
+class Command(BaseCommand):
+    help = ("Benchmark saving graded essays from parallel workers with the default SQLite "
+            "configuration and the tuned profile (WAL, busy timeout, pragmas, batched commits).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--essays', type=int, default=50, help="Essays graded and saved per worker.")
+        parser.add_argument('--profile', choices=PROFILES, action='append', help="Profile(s) to run (default: both).")
+        parser.add_argument('--lt-latency', type=float, default=0.0, help="Mean stub LanguageTool latency (ms).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError("This benchmark targets SQLite.")
+        corpus = synthetic_corpus(max(20, options['essays']), options['seed'])
+        results = []
+        with LanguageToolStub(options['lt_latency'], options['lt_latency'] / 3) as stub:
+            previous_lt = ai._LT
+            ai.configure_language_tool(stub.url)
+            try:
+                for profile in options['profile'] or PROFILES:
+                    results.append(self._run(profile, corpus, options['workers'], options['essays']))
+            finally:
+                ai._LT = previous_lt
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'profile':<9}{'saved':>7}{'errors':>7}{'locked':>7}{'wall s':>8}{'essays/s':>10}{'save p50':>10}{'save p95':>10}{'save max':>10}{'journal':>9}")
+        for r in results:
+            self.stdout.write(
+                f"{r['profile']:<9}{r['saved']:>7}{r['errors']:>7}{r['lock_errors']:>7}{r['wall_seconds']:>8.2f}"
+                f"{r['essays_per_second']:>10.1f}{r['save_p50_ms']:>10.1f}{r['save_p95_ms']:>10.1f}{r['save_max_ms']:>10.1f}{r['journal_mode']:>9}"
+            )
+
+    def _run(self, profile, corpus, workers, per_worker):
+        tuning = dict(sqlite_tuning(), ENABLED=(profile == 'tuned'))
+        conn = connections['default']
+        options = conn.settings_dict.setdefault('OPTIONS', {})
+        saved_options = dict(options)
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SQLITE_TUNING=tuning):
+            options.pop('timeout', None)
+            if tuning['ENABLED']:
+                options['timeout'] = 20
+            use_scratch_database(os.path.join(tmp, f'{profile}.sqlite3'))
+
+            lock = threading.Lock()
+            save_ms, errors, lock_errors = [], [0], [0]
+
+            def worker(worker_id):
+                try:
+                    for i in range(per_worker):
+                        text = corpus[(worker_id * per_worker + i) % len(corpus)]
+                        result = grade_text(text['content'])
+                        essay = Essay(
+                            title=text['title'],
+                            student_name=f"bench-{worker_id}",
+                            content=text['content'],
+                            score_length=result['length_score'],
+                            score_clarity=result['clarity_score'],
+                            score_vocabulary=result['vocab_score'],
+                            score_readability=result['readability_score'],
+                            score_overall=result['overall'],
+                            feedback=result['feedback'],
+                            analysis=result.get('ai', {}),
+                        )
+                        start = time.perf_counter()
+                        try:
+                            save_result(essay)
+                        except Exception as e:
+                            with lock:
+                                errors[0] += 1
+                                lock_errors[0] += _is_lock_error(e)
+                            continue
+                        with lock:
+                            save_ms.append((time.perf_counter() - start) * 1000.0)
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                reset_coalescer()
+                wall = time.perf_counter() - start
+
+            with conn.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+            saved = Essay.objects.count()
+            conn.close()
+        options.clear()
+        options.update(saved_options)
+
+        return {
+            'profile': profile,
+            'workers': workers,
+            'saved': saved,
+            'errors': errors[0],
+            'lock_errors': lock_errors[0],
+            'wall_seconds': round(wall, 3),
+            'essays_per_second': round(saved / wall, 2) if wall else 0.0,
+            'save_p50_ms': round(percentile(save_ms, 50), 2),
+            'save_p95_ms': round(percentile(save_ms, 95), 2),
+            'save_max_ms': round(max(save_ms), 2) if save_ms else 0.0,
+            'journal_mode': journal_mode,
+        }
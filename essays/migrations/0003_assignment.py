@@ -0,0 +1,32 @@
+# Generated by Django 4.2.13 on 2026-10-18 22:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('essays', '0002_essay_analysis_alter_essay_feedback_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Assignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('prompt', models.TextField(blank=True)),
+                ('keywords', models.TextField(blank=True, help_text='Comma-separated keywords expected in a relevant essay.')),
+                ('target_words', models.PositiveIntegerField(default=150)),
+                ('weights', models.JSONField(blank=True, default=dict, help_text='Overall-score weights: length, clarity, vocabulary, readability.')),
+                ('ml_weights', models.JSONField(blank=True, default=dict, help_text='Fallback ML weights: readability, grammar, sentiment, richness, length, structure.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='essay',
+            name='assignment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='essays', to='essays.assignment'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.13 on 2026-10-18 22:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('essays', '0003_assignment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShadowModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('path', models.CharField(help_text='Path to a candidate scorer pickle.', max_length=500)),
+                ('sample_rate', models.FloatField(default=0.1, help_text='Fraction of live essays scored in shadow (0–1).')),
+                ('active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ShadowPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('production_score', models.FloatField()),
+                ('candidate_score', models.FloatField(blank=True, null=True)),
+                ('production_ms', models.FloatField()),
+                ('candidate_ms', models.FloatField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('essay', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shadow_predictions', to='essays.essay')),
+                ('shadow_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predictions', to='essays.shadowmodel')),
+            ],
+        ),
+    ]
@@ -1,6 +1,47 @@
 from django.db import models
 from django.db.models import JSONField
+from django.utils import timezone
+
+
+class AssignmentQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # Bulk updates bypass auto_now; stamp updated_at so cached rubrics are revalidated.
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+
+class Assignment(models.Model):
+    title = models.CharField(max_length=200)
+    prompt = models.TextField(blank=True)
+    keywords = models.TextField(blank=True, help_text="Comma-separated keywords expected in a relevant essay.")
+    target_words = models.PositiveIntegerField(default=150)
+    weights = models.JSONField(default=dict, blank=True,
+                               help_text="Overall-score weights: length, clarity, vocabulary, readability.")
+    ml_weights = models.JSONField(default=dict, blank=True,
+                                  help_text="Fallback ML weights: readability, grammar, sentiment, richness, length, structure.")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AssignmentQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .rubrics import refresh_rubric
+        refresh_rubric(self)
+
+    def delete(self, *args, **kwargs):
+        from .rubrics import evict_rubric
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        evict_rubric(pk)
+        return result
+
+    def __str__(self):
+        return self.title
+
+
 class Essay(models.Model):
+    assignment = models.ForeignKey(Assignment, on_delete=models.SET_NULL, blank=True, null=True, related_name='essays')
     title = models.CharField(max_length=200)
     student_name = models.CharField(max_length=100, blank=True, null=True)
     content = models.TextField()
@@ -15,4 +56,29 @@ class Essay(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class ShadowModel(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    path = models.CharField(max_length=500, help_text="Path to a candidate scorer pickle.")
+    sample_rate = models.FloatField(default=0.1, help_text="Fraction of live essays scored in shadow (0–1).")
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ShadowPrediction(models.Model):
+    shadow_model = models.ForeignKey(ShadowModel, on_delete=models.CASCADE, related_name='predictions')
+    essay = models.ForeignKey(Essay, on_delete=models.CASCADE, related_name='shadow_predictions')
+    production_score = models.FloatField()
+    candidate_score = models.FloatField(blank=True, null=True)
+    production_ms = models.FloatField()
+    candidate_ms = models.FloatField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.shadow_model} on essay {self.essay_id}"
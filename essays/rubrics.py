@@ -0,0 +1,193 @@
+import math
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Pattern
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+DEFAULT_TARGET_WORDS = 150
+
+DEFAULT_WEIGHTS = {
+    'length': 0.30,
+    'clarity': 0.30,
+    'vocabulary': 0.20,
+    'readability': 0.20,
+}
+
+DEFAULT_ML_WEIGHTS = {
+    'readability': 0.30,
+    'grammar': 0.30,
+    'sentiment': 0.10,
+    'richness': 0.15,
+    'length': 0.10,
+    'structure': 0.05,
+}
+
+
+def _normalized(weights: Optional[Dict[str, float]], defaults: Dict[str, float]) -> Dict[str, float]:
+    """Fill missing keys from ``defaults`` and rescale so the weights sum to 1."""
+    merged = dict(defaults)
+    for k, v in (weights or {}).items():
+        if k in defaults:
+            merged[k] = max(0.0, float(v))
+    total = sum(merged.values())
+    if total <= 0:
+        return dict(defaults)
+    return {k: v / total for k, v in merged.items()}
+
+
+def parse_keywords(raw) -> List[str]:
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    seen, out = set(), []
+    for k in raw:
+        k = str(k).strip()
+        if k and k.lower() not in seen:
+            seen.add(k.lower())
+            out.append(k)
+    return out
+
+
+@dataclass
+class RubricFeatures:
+    """Prompt-derived features of an Assignment, computed once per save."""
+    rubric_id: Optional[int]
+    target_words: int
+    weights: Dict[str, float]
+    ml_weights: Dict[str, float]
+    keywords: List[str] = field(default_factory=list)
+    vectorizer: Optional[TfidfVectorizer] = None
+    analyzer: Optional[Callable[[str], List[str]]] = None
+    prompt_vector: Optional[np.ndarray] = None
+    oov_idf: float = 1.0
+    keyword_re: Optional[Pattern] = None
+    version: Optional[datetime] = None
+
+    @classmethod
+    def build(cls, rubric_id, prompt: str, keywords, target_words: int = DEFAULT_TARGET_WORDS,
+              weights=None, ml_weights=None) -> "RubricFeatures":
+        keywords = parse_keywords(keywords)
+        target_words = max(1, int(target_words or DEFAULT_TARGET_WORDS))
+        features = cls(
+            rubric_id=rubric_id,
+            target_words=target_words,
+            weights=_normalized(weights, DEFAULT_WEIGHTS),
+            ml_weights=_normalized(ml_weights, DEFAULT_ML_WEIGHTS),
+            keywords=keywords,
+        )
+        target = " ".join([prompt or ""] + keywords).strip()
+        if target:
+            vec = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=1)
+            try:
+                X = vec.fit_transform([target])
+            except ValueError:
+                # Prompt made only of stop words: nothing to compare against.
+                X = None
+            if X is not None:
+                features.vectorizer = vec
+                features.analyzer = vec.build_analyzer()
+                features.prompt_vector = X.toarray().ravel()
+                # Smoothed idf of a term seen in none of the (single) prompt documents.
+                features.oov_idf = math.log(2.0) + 1.0
+        if keywords:
+            alternation = "|".join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True))
+            features.keyword_re = re.compile(r"\b(?:%s)\b" % alternation)
+        return features
+
+    def relevance(self, text: str) -> float:
+        """Cosine similarity (0–100) between the essay and the precomputed prompt vector.
+
+        The essay is weighted over its full vocabulary: terms absent from the prompt
+        add nothing to the dot product but still count towards the essay's norm.
+        """
+        if self.vectorizer is None or not text:
+            return 50.0
+        vocab = self.vectorizer.vocabulary_
+        idf = self.vectorizer.idf_
+        dot = norm2 = 0.0
+        for term, count in Counter(self.analyzer(text)).items():
+            idx = vocab.get(term)
+            if idx is None:
+                weight = count * self.oov_idf
+            else:
+                weight = count * idf[idx]
+                dot += weight * self.prompt_vector[idx]
+            norm2 += weight * weight
+        if norm2 == 0:
+            return 0.0
+        return round(dot / math.sqrt(norm2) * 100, 2)
+
+    def keyword_hits(self, text: str) -> List[str]:
+        if self.keyword_re is None or not text:
+            return []
+        found = {m.group(0) for m in self.keyword_re.finditer(text.lower())}
+        return [k for k in self.keywords if k.lower() in found]
+
+    def keyword_coverage(self, text: str) -> float:
+        if not self.keywords:
+            return 0.0
+        return round(len(self.keyword_hits(text)) / len(self.keywords) * 100, 2)
+
+
+DEFAULT_RUBRIC = RubricFeatures.build(None, "", [])
+
+_CACHE: Dict[int, RubricFeatures] = {}
+_LOCK = threading.Lock()
+
+
+def features_for_assignment(assignment) -> RubricFeatures:
+    return RubricFeatures.build(
+        assignment.pk,
+        assignment.prompt,
+        assignment.keywords,
+        target_words=assignment.target_words,
+        weights=assignment.weights,
+        ml_weights=assignment.ml_weights,
+    )
+
+
+def refresh_rubric(assignment) -> RubricFeatures:
+    features = features_for_assignment(assignment)
+    features.version = assignment.updated_at
+    with _LOCK:
+        _CACHE[assignment.pk] = features
+    return features
+
+
+def evict_rubric(rubric_id: int) -> None:
+    with _LOCK:
+        _CACHE.pop(rubric_id, None)
+
+
+def clear_rubric_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+
+
+def get_rubric(rubric_id: Optional[int]) -> RubricFeatures:
+    """Cached features for ``rubric_id``.
+
+    Each lookup checks the row's ``updated_at`` so edits made by another process,
+    or through ``QuerySet.update()``, are picked up on the next grade.
+    """
+    if rubric_id is None:
+        return DEFAULT_RUBRIC
+    from .models import Assignment
+    version = Assignment.objects.filter(pk=rubric_id).values_list('updated_at', flat=True).first()
+    if version is None:
+        evict_rubric(rubric_id)
+        return DEFAULT_RUBRIC
+    features = _CACHE.get(rubric_id)
+    if features is not None and features.version == version:
+        return features
+    try:
+        assignment = Assignment.objects.get(pk=rubric_id)
+    except Assignment.DoesNotExist:
+        return DEFAULT_RUBRIC
+    return refresh_rubric(assignment)
@@ -0,0 +1,174 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .ai import ML_MODEL_PATH, _extract_features, _features_to_vector, heuristic_score, load_scorer, predict_score
+from .models import Essay, ShadowModel, ShadowPrediction
+from .rubrics import get_rubric
+from .sqlite import save_result
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHADOW_SETTINGS = {
+    'ENABLED': True,
+    'MAX_WORKERS': 1,
+    'MAX_PENDING': 50,
+    'AGREEMENT_TOLERANCE': 5.0,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending: Optional[threading.BoundedSemaphore] = None
+
+
+def shadow_settings() -> Dict[str, object]:
+    conf = dict(DEFAULT_SHADOW_SETTINGS)
+    conf.update(getattr(settings, 'SHADOW_SCORING', {}))
+    return conf
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _pending
+    with _executor_lock:
+        if _executor is None:
+            conf = shadow_settings()
+            _executor = ThreadPoolExecutor(max_workers=int(conf['MAX_WORKERS']), thread_name_prefix='shadow-scorer')
+            _pending = threading.BoundedSemaphore(int(conf['MAX_PENDING']))
+        return _executor
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000.0
+
+
+def _production_model():
+    """The production scorer, or None when grading falls back to the heuristic."""
+    if os.path.exists(ML_MODEL_PATH):
+        try:
+            return load_scorer(ML_MODEL_PATH)
+        except Exception:
+            pass
+    return None
+
+
+def _essay_features(essay: Essay) -> Dict[str, float]:
+    """Features stored by grade_text, re-extracted only for essays graded without them."""
+    stored = (essay.analysis or {}).get('ml_features') or {}
+    try:
+        _features_to_vector(stored)
+        return stored
+    except KeyError:
+        return _extract_features(essay.content)
+
+
+def score_in_shadow(essay: Essay, candidates: List[ShadowModel]) -> List[ShadowPrediction]:
+    """Score ``essay`` with production and each candidate.
+
+    Models are loaded before timing, so production_ms and candidate_ms cover
+    inference only.
+    """
+    feat = _essay_features(essay)
+    production = _production_model()
+    if production is not None:
+        production_score, production_ms = _timed(predict_score, production, feat)
+    else:
+        weights = get_rubric(essay.assignment_id).ml_weights
+        production_score, production_ms = _timed(heuristic_score, feat, weights)
+    results = []
+    for candidate in candidates:
+        pred = ShadowPrediction(
+            shadow_model=candidate,
+            essay=essay,
+            production_score=production_score,
+            production_ms=production_ms,
+        )
+        try:
+            model = load_scorer(candidate.path)
+        except Exception as e:
+            pred.error = f"{type(e).__name__}: {e}"
+        else:
+            try:
+                pred.candidate_score, pred.candidate_ms = _timed(predict_score, model, feat)
+            except Exception as e:
+                pred.error = f"{type(e).__name__}: {e}"
+        save_result(pred, wait=False)
+        results.append(pred)
+    return results
+
+
+def _run(essay_id: int, candidate_ids: List[int]) -> None:
+    close_old_connections()
+    try:
+        essay = Essay.objects.get(pk=essay_id)
+        candidates = list(ShadowModel.objects.filter(pk__in=candidate_ids))
+        score_in_shadow(essay, candidates)
+    except Exception:
+        logger.exception("Shadow scoring failed for essay %s", essay_id)
+    finally:
+        _pending.release()
+        close_old_connections()
+
+
+def sample_candidates(rng=random) -> List[ShadowModel]:
+    return [m for m in ShadowModel.objects.filter(active=True) if rng.random() < m.sample_rate]
+
+
+def submit(essay: Essay) -> bool:
+    """Queue ``essay`` for shadow scoring; returns False if sampled out or the queue is full."""
+    if not shadow_settings()['ENABLED']:
+        return False
+    candidates = sample_candidates()
+    if not candidates:
+        return False
+    executor = _get_executor()
+    if not _pending.acquire(blocking=False):
+        logger.info("Shadow queue full, skipping essay %s", essay.pk)
+        return False
+    executor.submit(_run, essay.pk, [c.pk for c in candidates])
+    return True
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+def shadow_report(tolerance: Optional[float] = None) -> List[Dict[str, object]]:
+    """Drift, agreement and inference cost for every registered candidate."""
+    if tolerance is None:
+        tolerance = float(shadow_settings()['AGREEMENT_TOLERANCE'])
+    report = []
+    for model in ShadowModel.objects.order_by('name'):
+        rows = list(model.predictions.values_list(
+            'production_score', 'candidate_score', 'production_ms', 'candidate_ms'))
+        scored = [r for r in rows if r[1] is not None]
+        diffs = [c - p for p, c, _, _ in scored]
+        prod_ms = [r[2] for r in scored]
+        cand_ms = [r[3] for r in scored]
+        n = len(scored)
+        report.append({
+            'name': model.name,
+            'active': model.active,
+            'samples': n,
+            'errors': len(rows) - n,
+            'mean_drift': round(sum(diffs) / n, 2) if n else 0.0,
+            'mean_abs_diff': round(sum(abs(d) for d in diffs) / n, 2) if n else 0.0,
+            'agreement': round(sum(1 for d in diffs if abs(d) <= tolerance) / n * 100, 1) if n else 0.0,
+            'production_ms_mean': round(sum(prod_ms) / n, 3) if n else 0.0,
+            'production_ms_p95': round(_percentile(prod_ms, 95), 3),
+            'candidate_ms_mean': round(sum(cand_ms) / n, 3) if n else 0.0,
+            'candidate_ms_p95': round(_percentile(cand_ms, 95), 3),
+        })
+    return report
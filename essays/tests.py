@@ -1,4 +1,25 @@
-from django.test import TestCase
+import contextlib
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+import joblib
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from . import ai
+from .loadtest import LanguageToolStub, run_load, synthetic_corpus
+from .models import Assignment, Essay, ShadowModel
+from .rubrics import clear_rubric_cache, get_rubric
+from .shadow import score_in_shadow, shadow_report
+from .sqlite import WriteCoalescer, apply_pragmas, sqlite_tuning
 from .utils import grade_text
 
 class GradingTests(TestCase):
@@ -8,3 +29,227 @@ class GradingTests(TestCase):
         self.assertIn('overall', result)
         self.assertGreaterEqual(result['overall'], 0)
         self.assertLessEqual(result['overall'], 100)
+
+    def test_grammar_is_checked_once_per_grade(self):
+        previous = ai._LT
+        try:
+            with LanguageToolStub(latency_ms=0, jitter_ms=0) as stub:
+                ai.configure_language_tool(stub.url)
+                result = grade_text("This is a simple sentence. It has some words.")
+                self.assertEqual(stub.requests, 1)
+                self.assertIn('grammar', result['ai']['ml_features'])
+        finally:
+            ai._LT = previous
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        Essay.objects.create(title="Climate", student_name="Asha", content="Text one.",
+                             score_overall=72.5, feedback="Good", analysis={"sentiment": 60, "grammar": {"issues": [1, 2], "grammar_score": 96}})
+        Essay.objects.create(title="History", student_name="Ravi", content="Text two.", score_overall=40)
+        staff = User.objects.create_user("teacher", password="pw", is_staff=True)
+        self.client.force_login(staff)
+
+    def test_anonymous_users_cannot_export(self):
+        self.client.logout()
+        response = self.client.get(reverse('essays:export'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin:login'), response['Location'])
+
+    def test_csv_cells_are_not_formulas(self):
+        Essay.objects.create(title="=HYPERLINK(\"http://x\")", student_name="@eve", content="Text.", feedback="-1+1")
+        response = self.client.get(reverse('essays:export'), {'student': 'eve'})
+        row = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))[0]
+        self.assertEqual(row['title'], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(row['student_name'], "'@eve")
+        self.assertEqual(row['feedback'], "'-1+1")
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get(reverse('essays:export'), {'student': 'asha'})
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content).decode()
+        lines = body.strip().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("id,created_at,assignment_id,title"))
+        self.assertIn("Climate", lines[1])
+
+    def test_ndjson_export_includes_analysis_metrics(self):
+        response = self.client.get(reverse('essays:export'), {'format': 'ndjson', 'title': 'climate'})
+        rows = [json.loads(l) for l in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['grammar_issues'], 2)
+        self.assertEqual(rows[0]['grammar_score'], 96)
+
+    def test_invalid_date_is_rejected(self):
+        response = self.client.get(reverse('essays:export'), {'start': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('export_essays', '--format', 'ndjson', stdout=out)
+        self.assertEqual(len(out.getvalue().strip().splitlines()), 2)
+
+
+class RubricTests(TestCase):
+    def setUp(self):
+        clear_rubric_cache()
+        self.assignment = Assignment.objects.create(
+            title="Renewable energy",
+            prompt="Discuss the benefits of solar power and wind turbines for cities.",
+            keywords="solar, wind, emissions",
+            target_words=20,
+            weights={'length': 1, 'clarity': 0, 'vocabulary': 0, 'readability': 0},
+        )
+
+    def test_rubric_is_cached_on_save(self):
+        features = get_rubric(self.assignment.pk)
+        self.assertIs(features, get_rubric(self.assignment.pk))
+        self.assertEqual(features.keywords, ['solar', 'wind', 'emissions'])
+        self.assertAlmostEqual(sum(features.weights.values()), 1.0)
+
+    def test_relevance_uses_prompt_vector(self):
+        features = get_rubric(self.assignment.pk)
+        on_topic = features.relevance("Solar power and wind turbines give cities clean energy.")
+        off_topic = features.relevance("My favourite food is pasta with tomato sauce.")
+        self.assertGreater(on_topic, off_topic)
+        self.assertEqual(off_topic, 0.0)
+
+    def test_grade_text_applies_assignment(self):
+        text = "Solar panels cut emissions. " * 5
+        result = grade_text(text, self.assignment.pk)
+        self.assertEqual(result['overall'], result['length_score'])
+        self.assertEqual(result['ai']['keyword_coverage'], 66.67)
+        self.assertIn("wind", result['feedback'])
+
+    def test_off_topic_essay_with_one_keyword_scores_low(self):
+        features = get_rubric(self.assignment.pk)
+        paragraph = ("The football season started with a thrilling match on Saturday. The striker scored "
+                     "twice, the coach changed the formation and the crowd sang until the final whistle. Solar.")
+        self.assertLess(features.relevance("\n\n".join([paragraph] * 3)), 40)
+
+    def test_bulk_update_invalidates_cached_features(self):
+        get_rubric(self.assignment.pk)
+        Assignment.objects.filter(pk=self.assignment.pk).update(keywords="tides", target_words=300)
+        features = get_rubric(self.assignment.pk)
+        self.assertEqual(features.keywords, ['tides'])
+        self.assertEqual(features.target_words, 300)
+
+    def test_saving_refreshes_cached_features(self):
+        self.assignment.keywords = "tides"
+        self.assignment.save()
+        self.assertEqual(get_rubric(self.assignment.pk).keywords, ['tides'])
+
+
+class ShadowScoringTests(TestCase):
+    def setUp(self):
+        from sklearn.dummy import DummyRegressor
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "candidate.pkl")
+        joblib.dump(DummyRegressor(strategy="constant", constant=70.0).fit([[0] * 7], [70.0]), path)
+        self.candidate = ShadowModel.objects.create(name="rf-v2", path=path, sample_rate=1.0)
+        self.essay = Essay.objects.create(title="Test", content="This is a short essay. It has two sentences.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_score_in_shadow_records_both_predictions(self):
+        preds = score_in_shadow(self.essay, [self.candidate])
+        self.assertEqual(len(preds), 1)
+        self.assertEqual(preds[0].candidate_score, 70.0)
+        self.assertGreaterEqual(preds[0].production_ms, 0)
+        self.assertGreaterEqual(preds[0].candidate_ms, 0)
+
+    def test_stored_features_are_reused(self):
+        result = grade_text(self.essay.content)
+        self.essay.analysis = result['ai']
+        with mock.patch('essays.shadow._extract_features', side_effect=AssertionError("re-extracted")):
+            pred = score_in_shadow(self.essay, [self.candidate])[0]
+        self.assertEqual(pred.candidate_score, 70.0)
+
+    def test_production_score_uses_assignment_weights(self):
+        assignment = Assignment.objects.create(
+            title="Grammar only", ml_weights={'grammar': 1, 'readability': 0, 'sentiment': 0,
+                                              'richness': 0, 'length': 0, 'structure': 0})
+        essay = Essay.objects.create(assignment=assignment, title="T", content=self.essay.content)
+        result = grade_text(essay.content, assignment.pk)
+        essay.analysis = result['ai']
+        pred = score_in_shadow(essay, [self.candidate])[0]
+        self.assertEqual(pred.production_score, result['ai']['ml_overall'])
+        self.assertEqual(pred.production_score, result['ai']['ml_features']['grammar'])
+
+    def test_missing_candidate_file_is_recorded_as_error(self):
+        broken = ShadowModel.objects.create(name="broken", path="/nonexistent.pkl")
+        pred = score_in_shadow(self.essay, [broken])[0]
+        self.assertIsNone(pred.candidate_score)
+        self.assertIn("FileNotFoundError", pred.error)
+
+    def test_report(self):
+        score_in_shadow(self.essay, [self.candidate])
+        row = shadow_report(tolerance=100.0)[0]
+        self.assertEqual(row['name'], "rf-v2")
+        self.assertEqual(row['samples'], 1)
+        self.assertEqual(row['agreement'], 100.0)
+        out = StringIO()
+        call_command('shadow_report', stdout=out)
+        self.assertIn("rf-v2", out.getvalue())
+
+
+class LoadTestHarnessTests(TransactionTestCase):
+    def test_grammar_checks_go_through_stub(self):
+        previous = ai._LT
+        try:
+            with LanguageToolStub(latency_ms=1, jitter_ms=0) as stub:
+                self.assertIsNotNone(ai.configure_language_tool(stub.url))
+                result = ai.grammar_suggestions("This sentence is fine.")
+                self.assertEqual(result['grammar_score'], 100)
+                self.assertEqual(stub.requests, 1)
+        finally:
+            ai._LT = previous
+
+    def test_run_load_reports_each_view(self):
+        corpus = synthetic_corpus(5, seed=1, min_words=20, max_words=40)
+        with contextlib.redirect_stdout(StringIO()):
+            report = run_load(corpus, requests=12, concurrency=1, mix={'submit': 2, 'detail': 1, 'dashboard': 1})
+        self.assertEqual(report['requests'], 12)
+        self.assertEqual(report['errors'], 0)
+        self.assertIn('submit', report['views'])
+        self.assertGreater(report['views']['submit']['queries_mean'], 0)
+        self.assertGreater(report['views']['submit']['write_ms_total'], 0)
+        self.assertEqual(report['views']['dashboard']['write_ms_total'], 0)
+        self.assertEqual(Essay.objects.count(), report['views']['submit']['requests'])
+
+
+class SQLiteTuningTests(TransactionTestCase):
+    def test_pragmas_applied_when_enabled(self):
+        tuning = dict(sqlite_tuning(), ENABLED=True, PRAGMAS={'cache_size': -4321})
+        with override_settings(SQLITE_TUNING=tuning):
+            apply_pragmas(None, connection)
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -4321)
+
+    def test_coalescer_commits_queued_saves_in_one_batch(self):
+        coalescer = WriteCoalescer(batch_size=10, delay_ms=200)
+        try:
+            essays = [Essay(title=f"Batch {i}", content="Text.") for i in range(5)]
+            futures = [coalescer.submit(e) for e in essays]
+            for f in futures:
+                f.result(timeout=5)
+        finally:
+            coalescer.stop()
+        self.assertEqual(coalescer.batches, 1)
+        self.assertEqual(coalescer.stats()['saved'], 5)
+        self.assertEqual(Essay.objects.filter(title__startswith="Batch").count(), 5)
+        self.assertTrue(all(e.pk for e in essays))
+
+    def test_coalescer_isolates_failing_row(self):
+        coalescer = WriteCoalescer(batch_size=10, delay_ms=200)
+        try:
+            good = coalescer.submit(Essay(title="Good", content="Text."))
+            bad = coalescer.submit(Essay(title=None, content="Text."))
+            good.result(timeout=5)
+            with self.assertRaises(IntegrityError):
+                bad.result(timeout=5)
+        finally:
+            coalescer.stop()
+        self.assertEqual(list(Essay.objects.values_list('title', flat=True)), ["Good"])
@@ -8,4 +8,5 @@ urlpatterns = [
     path('submit/', views.submit_essay, name='submit'),
     path('essay/<int:pk>/', views.essay_detail, name='detail'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('export/', views.export_essays, name='export'),
 ]
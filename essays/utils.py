@@ -2,7 +2,8 @@ import re
 import math
 from collections import Counter
 from typing import Dict, Any, Optional, List
-from .ai import readability_metrics, sentiment_score, grammar_suggestions, topic_relevance, ml_score
+from .ai import readability_metrics, sentiment_score, grammar_suggestions, ml_score
+from .rubrics import get_rubric
 
 SENTENCE_SPLIT = re.compile(r'[.!?]+(?=\s|$)')
 WORD_RE = re.compile(r"[A-Za-z']+")
@@ -55,12 +56,14 @@ def estimate_syllables(w):
         count -= 1
     return max(1, count)
 
-def grade_text(text: str):
+def grade_text(text: str, assignment_id: Optional[int] = None):
+    rubric = get_rubric(assignment_id)
+    weights = rubric.weights
     sents = split_sentences(text)
     tokens = words(text)
     total_words = len(tokens)
     total_sents = len(sents)
-    length_score = min(100.0, (total_words / 150.0) * 100.0)
+    length_score = min(100.0, (total_words / rubric.target_words) * 100.0)
     avg_sent_len = (total_words / total_sents) if total_sents else 0
     if avg_sent_len <= 20:
         clarity_score = 100.0
@@ -77,15 +80,20 @@ def grade_text(text: str):
     repeated = [w for w, c in counts.items() if c >= 5 and len(w) > 3]
     miss = [(w, COMMON_MISSPELLINGS[w]) for w in tokens if w in COMMON_MISSPELLINGS]
     overall = round(
-        0.30 * length_score +
-        0.30 * clarity_score +
-        0.20 * vocab_score +
-        0.20 * readability_score, 2
+        weights['length'] * length_score +
+        weights['clarity'] * clarity_score +
+        weights['vocabulary'] * vocab_score +
+        weights['readability'] * readability_score, 2
     )
     feedback_lines = []
     feedback_lines.append(f"Words: {total_words}, Sentences: {total_sents}, Avg sentence length: {avg_sent_len:.1f}")
-    if total_words < 150:
-        feedback_lines.append("• Expand your essay to at least ~150 words to cover the topic more fully.")
+    if total_words < rubric.target_words:
+        feedback_lines.append(f"• Expand your essay to at least ~{rubric.target_words} words to cover the topic more fully.")
+    if rubric.keywords:
+        hits = rubric.keyword_hits(text)
+        missing = [k for k in rubric.keywords if k not in hits]
+        if missing:
+            feedback_lines.append(f"• The assignment expects you to address: {', '.join(missing[:8])}.")
     if avg_sent_len > 24:
         feedback_lines.append("• Consider splitting long sentences for clarity.")
     if ttr < 0.4:
@@ -114,6 +122,7 @@ def grade_text(text: str):
         ai_analysis['sentiment'] = sentiment_score(text).get("positivity", 0)
     except:
         ai_analysis['sentiment'] = 0
+    grammar_res = None
     try:
         grammar_res = grammar_suggestions(text)
         ai_analysis['grammar'] = {
@@ -124,12 +133,14 @@ def grade_text(text: str):
         ai_analysis['grammar'] = {"issues": [], "grammar_score": 0}
 
     try:
-        ai_analysis['topic_relevance'] = topic_relevance(text, "")
+        ai_analysis['topic_relevance'] = rubric.relevance(text)
     except:
         ai_analysis['topic_relevance'] = 0
+    if rubric.keywords:
+        ai_analysis['keyword_coverage'] = rubric.keyword_coverage(text)
 
     try:
-        ml_overall, feat = ml_score(text)
+        ml_overall, feat = ml_score(text, rubric.ml_weights, grammar_res)
         ai_analysis['ml_overall'] = ml_overall
         ai_analysis['ml_features'] = feat
     except:
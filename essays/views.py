@@ -1,8 +1,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from .forms import EssayForm
 from .models import Essay
 from .utils import grade_text
+from .export import EXPORT_FORMATS, filter_essays, stream_export
+from .rubrics import get_rubric
+from .sqlite import save_result
+from . import shadow
 from .ai import readability_metrics, sentiment_score, grammar_suggestions, topic_relevance, ml_score
 from django.utils import timezone
 from django.db.models.functions import TruncDate
@@ -18,7 +24,7 @@ def submit_essay(request):
         form = EssayForm(request.POST)
         if form.is_valid():
             essay = form.save(commit=False)
-            result = grade_text(essay.content)
+            result = grade_text(essay.content, essay.assignment_id)
             essay.score_length = result['length_score']
             essay.score_clarity = result['clarity_score']
             essay.score_vocabulary = result['vocab_score']
@@ -26,7 +32,8 @@ def submit_essay(request):
             essay.score_overall = result['overall']
             essay.feedback = result['feedback']
             essay.analysis = result.get('ai', {})
-            essay.save()
+            save_result(essay)
+            shadow.submit(essay)
             messages.success(request, 'Essay graded successfully!')
             return redirect('essays:detail', pk=essay.pk)
         else:
@@ -37,6 +44,7 @@ def submit_essay(request):
 
 def essay_detail(request, pk):
     essay = get_object_or_404(Essay, pk=pk)
+    rubric = get_rubric(essay.assignment_id)
     ai_analysis = {}
     text = essay.content
     
@@ -52,6 +60,7 @@ def essay_detail(request, pk):
         print(f"Sentiment error: {e}")
         ai_analysis['sentiment'] = 0
         
+    grammar_result = None
     try:
         grammar_result = grammar_suggestions(text)
         ai_analysis['grammar'] = {
@@ -63,13 +72,16 @@ def essay_detail(request, pk):
         ai_analysis['grammar'] = {"score": 0, "issues": []}
 
     try:
-        ai_analysis['topic_relevance'] = topic_relevance(text, essay.title)
+        if essay.assignment_id:
+            ai_analysis['topic_relevance'] = rubric.relevance(text)
+        else:
+            ai_analysis['topic_relevance'] = topic_relevance(text, essay.title)
     except Exception as e:
         print(f"Topic relevance error: {e}")
         ai_analysis['topic_relevance'] = 0
 
     try:
-        ml_overall, _ = ml_score(text)
+        ml_overall, _ = ml_score(text, rubric.ml_weights, grammar_result)
         ai_analysis['ml_overall'] = ml_overall
     except Exception as e:
         print(f"ML score error: {e}")
@@ -103,7 +115,7 @@ def dashboard(request):
                 result = essay.cached_result
             else:
                 try:
-                    result = grade_text(essay.content)
+                    result = grade_text(essay.content, essay.assignment_id)
                 except Exception as e:
                     print(f"Grading error for essay {essay.pk}: {e}")
                     result = {
@@ -205,4 +217,24 @@ def dashboard(request):
     print(f"Labels: {len(labels)}, Scores: {len(overall_scores)}")
     print(f"Sentiments: {len(sentiments)}, Grammar: {len(grammar_counts)}")
     
-    return render(request, 'essays/dashboard.html', context)
\ No newline at end of file
+    return render(request, 'essays/dashboard.html', context)
+
+@staff_member_required
+def export_essays(request):
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"Unsupported format: {fmt}")
+    try:
+        qs = filter_essays(
+            request.GET.get('start'),
+            request.GET.get('end'),
+            request.GET.get('student'),
+            request.GET.get('title'),
+        )
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(stream_export(qs, fmt), content_type=content_type)
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="essays-{stamp}.{fmt}"'
+    return response
@@ -47,10 +47,28 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'project.wsgi.application'
 
+# High-concurrency SQLite profile (SQLITE_TUNING=1): WAL journaling, a busy
+# timeout and tuned pragmas on every connection, and grading results saved
+# through a single writer thread in short batched transactions.
+SQLITE_TUNING = {
+    'ENABLED': os.environ.get('SQLITE_TUNING', '') == '1',
+    'PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 20000,
+        'cache_size': -20000,
+        'temp_store': 'MEMORY',
+    },
+    'BATCH_WRITES': True,
+    'BATCH_SIZE': 50,
+    'BATCH_DELAY_MS': 5,
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {'timeout': 20} if SQLITE_TUNING['ENABLED'] else {},
     }
 }
 
@@ -71,3 +89,12 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Candidate scorers registered as ShadowModel rows are evaluated off the request
+# path on a bounded background pool; essays beyond MAX_PENDING are not shadowed.
+SHADOW_SCORING = {
+    'ENABLED': True,
+    'MAX_WORKERS': 1,
+    'MAX_PENDING': 50,
+    'AGREEMENT_TOLERANCE': 5.0,
+}